@@ -4,37 +4,224 @@ Generate comparison charts from benchmark results
 Compares NATS, Pulsar, and Pravega across different workloads
 """
 
+import argparse
+import functools
+import hashlib
 import json
-import sys
 import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
+from typing import List, Dict, Any, Callable, Optional
 import numpy as np
 
-def load_results(results_dir: str) -> List[Dict[str, Any]]:
-    """Load all JSON result files from directory"""
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps_impl = functools.partial(
+        orjson.dumps, option=orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+except ImportError:
+    _loads = json.loads
+    _dumps_impl = functools.partial(json.dumps, sort_keys=True, default=lambda o: o.tolist())
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize to JSON bytes with sorted keys, converting NumPy arrays and scalars to plain values"""
+    out = _dumps_impl(obj)
+    return out if isinstance(out, bytes) else out.encode()
+
+try:
+    import ijson
+    try:
+        ijson = ijson.get_backend('yajl2_c')
+    except ImportError:
+        pass
+except ImportError:
+    ijson = None
+
+# Per-interval metrics the charts and reports aggregate
+METRIC_KEYS = (
+    'publishRate',
+    'consumeRate',
+    'publishLatency50pct',
+    'publishLatency95pct',
+    'publishLatency99pct',
+    'endToEndLatencyAvg',
+    'endToEndLatency99pct',
+)
+RESULT_FIELDS = ('driver', 'workload') + METRIC_KEYS
+WANTED_FIELDS = frozenset(RESULT_FIELDS)
+
+# Parsed results are cached here, keyed by file name and modification time
+CACHE_FILE = '.cache.parquet'
+
+# Bump whenever parsing or normalization changes, so cached rows are re-parsed
+CACHE_VERSION = 1
+CACHE_COLUMNS = ('file', 'mtime_ns', 'cache_version') + RESULT_FIELDS
+
+# Below this many files, process start-up costs more than it saves
+PARALLEL_LOAD_MIN_FILES = 8
+
+# Below this many workloads, rendering in-process beats starting a pool
+PARALLEL_RENDER_MIN_WORKLOADS = 4
+
+# Files at least this large are stream-parsed with ijson to cap memory;
+# smaller ones parse faster in one go
+STREAM_MIN_BYTES = 16 * 1024 * 1024
+
+def _stream_fields(f) -> Dict[str, Any]:
+    """Stream-parse only the wanted fields, averaging per-interval lists on the fly"""
+    data = {}
+    sums = {}
+    counts = {}
+    
+    events = ijson.parse(f, use_float=True)
+    if next(events, (None, None, None))[1] != 'start_map':
+        raise ValueError("expected a JSON object at the top level")
+    
+    for prefix, event, value in events:
+        if prefix in WANTED_FIELDS:
+            if event == 'start_array':
+                sums[prefix] = 0.0
+                counts[prefix] = 0
+            elif event in ('string', 'number'):
+                data[prefix] = value
+        elif event == 'number' and prefix.endswith('.item'):
+            key = prefix[:-len('.item')]
+            if key in sums:
+                sums[key] += value
+                counts[key] += 1
+    
+    for key, total in sums.items():
+        data[key] = total / counts[key] if counts[key] else 0.0
+    
+    return data
+
+def _normalize(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce each metric to a scalar mean so later lookups are plain floats"""
+    list_keys = []
+    for key in METRIC_KEYS:
+        val = data.get(key, 0)
+        if isinstance(val, (list, np.ndarray)):
+            list_keys.append(key)
+        else:
+            data[key] = float(val) if val else 0.0
+    
+    if list_keys:
+        # Pad the per-interval lists into one NaN-filled matrix and reduce all rows at once
+        width = max(len(data[key]) for key in list_keys)
+        values = np.full((len(list_keys), width), np.nan)
+        for row, key in enumerate(list_keys):
+            values[row, :len(data[key])] = data[key]
+        
+        counts = np.count_nonzero(~np.isnan(values), axis=1)
+        sums = np.nansum(values, axis=1)
+        means = np.divide(sums, counts, out=np.zeros(len(list_keys)), where=counts > 0)
+        for key, mean in zip(list_keys, means):
+            data[key] = float(mean)
+    
+    return data
+
+def _load_one(json_file: Path) -> Optional[Dict[str, Any]]:
+    """Load a single JSON result file, returning None if it cannot be parsed"""
+    try:
+        with open(json_file, 'rb') as f:
+            if ijson is not None and json_file.stat().st_size >= STREAM_MIN_BYTES:
+                data = _stream_fields(f)
+            else:
+                data = _loads(f.read())
+            # Extract driver and workload from filename or data
+            filename = json_file.stem
+            data['driver'] = data.get('driver', 'unknown')
+            data['workload'] = data.get('workload', filename)
+            data = _normalize(data)
+            # Keep only what is charted, the same shape as cached rows
+            return {key: data[key] for key in RESULT_FIELDS}
+    except Exception as e:
+        print(f"Error loading {json_file}: {e}")
+        return None
+
+def _import_pandas():
+    """Import pandas for the results cache, or return None if it or pyarrow is missing"""
+    try:
+        import pandas as pd
+        import pyarrow  # noqa: F401 -- parquet engine for the results cache
+    except ImportError:
+        return None
+    return pd
+
+def _read_cache(cache_path: Path) -> Dict[str, Any]:
+    """Read cached results as {file name: (mtime_ns, result)}"""
+    pd = _import_pandas()
+    if pd is None or not cache_path.exists():
+        return {}
+    try:
+        df = pd.read_parquet(cache_path)
+    except Exception as e:
+        print(f"Ignoring unreadable cache {cache_path}: {e}")
+        return {}
+    if tuple(df.columns) != CACHE_COLUMNS or (df['cache_version'] != CACHE_VERSION).any():
+        print(f"Ignoring outdated cache {cache_path}")
+        return {}
+    rows = df.drop(columns='cache_version').to_dict('records')
+    return {row.pop('file'): (row.pop('mtime_ns'), row) for row in rows}
+
+def _write_cache(cache_path: Path, entries: Dict[str, Any]):
+    """Write {file name: (mtime_ns, result)} entries to the cache"""
+    pd = _import_pandas()
+    if pd is None:
+        return
+    rows = [
+        {'file': name, 'mtime_ns': mtime_ns, 'cache_version': CACHE_VERSION,
+         **{key: data[key] for key in RESULT_FIELDS}}
+        for name, (mtime_ns, data) in entries.items()
+    ]
+    try:
+        pd.DataFrame(rows).to_parquet(cache_path, index=False)
+    except Exception as e:
+        print(f"Error writing cache {cache_path}: {e}")
+
+def load_results(results_dir: Path) -> List[Dict[str, Any]]:
+    """Load all JSON result files from directory, reusing cached parses of unchanged files"""
     results = []
     results_path = Path(results_dir)
-    
-    for json_file in results_path.glob("*.json"):
-        try:
-            with open(json_file, 'r') as f:
-                data = json.load(f)
-                # Extract driver and workload from filename or data
-                filename = json_file.stem
-                parts = filename.split('-')
-                
-                data['driver'] = data.get('driver', 'unknown')
-                data['workload'] = data.get('workload', filename)
-                results.append(data)
-                print(f"Loaded: {json_file.name}")
-        except Exception as e:
-            print(f"Error loading {json_file}: {e}")
+    cache_path = results_path / CACHE_FILE
+    json_files = sorted(results_path.glob("*.json"))
+    mtimes = {json_file.name: json_file.stat().st_mtime_ns for json_file in json_files}
+    
+    cached = _read_cache(cache_path)
+    stale = [json_file for json_file in json_files
+             if cached.get(json_file.name, (None,))[0] != mtimes[json_file.name]]
+    
+    if len(stale) >= PARALLEL_LOAD_MIN_FILES:
+        with ProcessPoolExecutor(max_workers=min(len(stale), os.cpu_count() or 1)) as executor:
+            loaded = list(executor.map(_load_one, stale))
+    else:
+        loaded = [_load_one(json_file) for json_file in stale]
+    
+    # Keep only cache rows for files that are still present and unmodified
+    entries = {name: entry for name, entry in cached.items()
+               if name in mtimes and entry[0] == mtimes[name]}
+    for json_file, data in zip(stale, loaded):
+        if data is not None:
+            entries[json_file.name] = (mtimes[json_file.name], data)
+    
+    for json_file in json_files:
+        if json_file.name in entries:
+            results.append(entries[json_file.name][1])
+            print(f"Loaded: {json_file.name}")
+    
+    if stale or len(entries) != len(cached):
+        _write_cache(cache_path, entries)
     
     return results
 
+def build_columns(results: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """Gather each metric across results into one float array"""
+    return {
+        key: np.fromiter((r[key] for r in results), dtype=np.float64, count=len(results))
+        for key in METRIC_KEYS
+    }
+
 def group_by_workload(results: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
     """Group results by workload name"""
     grouped = {}
@@ -45,31 +232,12 @@ def group_by_workload(results: List[Dict[str, Any]]) -> Dict[str, List[Dict[str,
         grouped[workload].append(result)
     return grouped
 
-def create_throughput_chart(results: List[Dict[str, Any]], output_dir: str):
+def create_throughput_chart(columns: Dict[str, np.ndarray], ax, x: np.ndarray, drivers: List[str]):
     """Create throughput comparison chart"""
-    drivers = [r['driver'] for r in results]
-    
-    # Extract and aggregate rates (handle lists/arrays by taking mean)
-    publish_rates = []
-    consume_rates = []
-    
-    for r in results:
-        pub_rate = r.get('publishRate', 0)
-        if isinstance(pub_rate, (list, np.ndarray)):
-            pub_rate = np.mean(pub_rate) if len(pub_rate) > 0 else 0
-        publish_rates.append(float(pub_rate))
-        
-        cons_rate = r.get('consumeRate', 0)
-        if isinstance(cons_rate, (list, np.ndarray)):
-            cons_rate = np.mean(cons_rate) if len(cons_rate) > 0 else 0
-        consume_rates.append(float(cons_rate))
-    
-    x = np.arange(len(drivers))
     width = 0.35
     
-    fig, ax = plt.subplots(figsize=(12, 6))
-    bars1 = ax.bar(x - width/2, publish_rates, width, label='Publish Rate', color='#2ecc71')
-    bars2 = ax.bar(x + width/2, consume_rates, width, label='Consume Rate', color='#3498db')
+    bars1 = ax.bar(x - width/2, columns['publishRate'], width, label='Publish Rate', color='#2ecc71')
+    bars2 = ax.bar(x + width/2, columns['consumeRate'], width, label='Consume Rate', color='#3498db')
     
     ax.set_xlabel('Driver', fontsize=12, fontweight='bold')
     ax.set_ylabel('Messages per Second', fontsize=12, fontweight='bold')
@@ -81,49 +249,15 @@ def create_throughput_chart(results: List[Dict[str, Any]], output_dir: str):
     
     # Add value labels on bars
     for bars in [bars1, bars2]:
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height,
-                   f'{int(height):,}',
-                   ha='center', va='bottom', fontsize=9)
-    
-    plt.tight_layout()
-    plt.savefig(f"{output_dir}/throughput_comparison.png", dpi=300)
-    print(f"Created: {output_dir}/throughput_comparison.png")
-    plt.close()
-
-def create_latency_chart(results: List[Dict[str, Any]], output_dir: str):
+        ax.bar_label(bars, labels=[f'{val:,.0f}' for val in bars.datavalues], fontsize=9)
+
+def create_latency_chart(columns: Dict[str, np.ndarray], ax, x: np.ndarray, drivers: List[str]):
     """Create latency comparison chart"""
-    drivers = [r['driver'] for r in results]
-    
-    # Extract and aggregate latencies (handle lists/arrays by taking mean)
-    p50 = []
-    p95 = []
-    p99 = []
-    
-    for r in results:
-        val = r.get('publishLatency50pct', 0)
-        if isinstance(val, (list, np.ndarray)):
-            val = np.mean(val) if len(val) > 0 else 0
-        p50.append(float(val))
-        
-        val = r.get('publishLatency95pct', 0)
-        if isinstance(val, (list, np.ndarray)):
-            val = np.mean(val) if len(val) > 0 else 0
-        p95.append(float(val))
-        
-        val = r.get('publishLatency99pct', 0)
-        if isinstance(val, (list, np.ndarray)):
-            val = np.mean(val) if len(val) > 0 else 0
-        p99.append(float(val))
-    
-    x = np.arange(len(drivers))
     width = 0.25
     
-    fig, ax = plt.subplots(figsize=(12, 6))
-    bars1 = ax.bar(x - width, p50, width, label='P50', color='#2ecc71')
-    bars2 = ax.bar(x, p95, width, label='P95', color='#f39c12')
-    bars3 = ax.bar(x + width, p99, width, label='P99', color='#e74c3c')
+    bars1 = ax.bar(x - width, columns['publishLatency50pct'], width, label='P50', color='#2ecc71')
+    bars2 = ax.bar(x, columns['publishLatency95pct'], width, label='P95', color='#f39c12')
+    bars3 = ax.bar(x + width, columns['publishLatency99pct'], width, label='P99', color='#e74c3c')
     
     ax.set_xlabel('Driver', fontsize=12, fontweight='bold')
     ax.set_ylabel('Latency (ms)', fontsize=12, fontweight='bold')
@@ -135,42 +269,14 @@ def create_latency_chart(results: List[Dict[str, Any]], output_dir: str):
     
     # Add value labels on bars
     for bars in [bars1, bars2, bars3]:
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height,
-                   f'{height:.2f}',
-                   ha='center', va='bottom', fontsize=8)
-    
-    plt.tight_layout()
-    plt.savefig(f"{output_dir}/latency_comparison.png", dpi=300)
-    print(f"Created: {output_dir}/latency_comparison.png")
-    plt.close()
-
-def create_end_to_end_latency_chart(results: List[Dict[str, Any]], output_dir: str):
+        ax.bar_label(bars, fmt='%.2f', fontsize=8)
+
+def create_end_to_end_latency_chart(columns: Dict[str, np.ndarray], ax, x: np.ndarray, drivers: List[str]):
     """Create end-to-end latency comparison chart"""
-    drivers = [r['driver'] for r in results]
-    
-    # Extract and aggregate latencies (handle lists/arrays by taking mean)
-    avg_latency = []
-    p99_latency = []
-    
-    for r in results:
-        val = r.get('endToEndLatencyAvg', 0)
-        if isinstance(val, (list, np.ndarray)):
-            val = np.mean(val) if len(val) > 0 else 0
-        avg_latency.append(float(val))
-        
-        val = r.get('endToEndLatency99pct', 0)
-        if isinstance(val, (list, np.ndarray)):
-            val = np.mean(val) if len(val) > 0 else 0
-        p99_latency.append(float(val))
-    
-    x = np.arange(len(drivers))
     width = 0.35
     
-    fig, ax = plt.subplots(figsize=(12, 6))
-    bars1 = ax.bar(x - width/2, avg_latency, width, label='Average', color='#3498db')
-    bars2 = ax.bar(x + width/2, p99_latency, width, label='P99', color='#e74c3c')
+    bars1 = ax.bar(x - width/2, columns['endToEndLatencyAvg'], width, label='Average', color='#3498db')
+    bars2 = ax.bar(x + width/2, columns['endToEndLatency99pct'], width, label='P99', color='#e74c3c')
     
     ax.set_xlabel('Driver', fontsize=12, fontweight='bold')
     ax.set_ylabel('Latency (ms)', fontsize=12, fontweight='bold')
@@ -182,137 +288,194 @@ def create_end_to_end_latency_chart(results: List[Dict[str, Any]], output_dir: s
     
     # Add value labels on bars
     for bars in [bars1, bars2]:
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height,
-                   f'{height:.2f}',
-                   ha='center', va='bottom', fontsize=9)
-    
-    plt.tight_layout()
-    plt.savefig(f"{output_dir}/end_to_end_latency_comparison.png", dpi=300)
-    print(f"Created: {output_dir}/end_to_end_latency_comparison.png")
-    plt.close()
-
-def create_summary_table(grouped_results: Dict[str, List[Dict[str, Any]]], output_dir: str):
+        ax.bar_label(bars, fmt='%.2f', fontsize=9)
+
+def create_summary_table(grouped_results: Dict[str, List[Dict[str, Any]]], output_dir: Path):
     """Create summary table as text file"""
-    with open(f"{output_dir}/summary.txt", 'w') as f:
-        f.write("=" * 100 + "\n")
-        f.write("BENCHMARK RESULTS SUMMARY\n")
-        f.write("Vehicle IoT Streaming - 100k Vehicles\n")
-        f.write("=" * 100 + "\n\n")
+    out = []
+    out.append("=" * 100 + "\n")
+    out.append("BENCHMARK RESULTS SUMMARY\n")
+    out.append("Vehicle IoT Streaming - 100k Vehicles\n")
+    out.append("=" * 100 + "\n\n")
+    
+    for workload, results in grouped_results.items():
+        out.append(f"\nWorkload: {workload}\n")
+        out.append("-" * 100 + "\n")
+        out.append(f"{'Driver':<15} {'Pub Rate':<15} {'Con Rate':<15} {'P50 Lat':<15} {'P99 Lat':<15} {'E2E Avg':<15}\n")
+        out.append("-" * 100 + "\n")
         
-        for workload, results in grouped_results.items():
-            f.write(f"\nWorkload: {workload}\n")
-            f.write("-" * 100 + "\n")
-            f.write(f"{'Driver':<15} {'Pub Rate':<15} {'Con Rate':<15} {'P50 Lat':<15} {'P99 Lat':<15} {'E2E Avg':<15}\n")
-            f.write("-" * 100 + "\n")
-            
-            for result in results:
-                driver = result.get('driver', 'unknown')
-                
-                # Extract and aggregate values (handle lists by taking mean)
-                pub_rate = result.get('publishRate', 0)
-                if isinstance(pub_rate, (list, np.ndarray)):
-                    pub_rate = np.mean(pub_rate) if len(pub_rate) > 0 else 0
-                
-                con_rate = result.get('consumeRate', 0)
-                if isinstance(con_rate, (list, np.ndarray)):
-                    con_rate = np.mean(con_rate) if len(con_rate) > 0 else 0
-                
-                p50_lat = result.get('publishLatency50pct', 0)
-                if isinstance(p50_lat, (list, np.ndarray)):
-                    p50_lat = np.mean(p50_lat) if len(p50_lat) > 0 else 0
-                
-                p99_lat = result.get('publishLatency99pct', 0)
-                if isinstance(p99_lat, (list, np.ndarray)):
-                    p99_lat = np.mean(p99_lat) if len(p99_lat) > 0 else 0
-                
-                e2e_avg = result.get('endToEndLatencyAvg', 0)
-                if isinstance(e2e_avg, (list, np.ndarray)):
-                    e2e_avg = np.mean(e2e_avg) if len(e2e_avg) > 0 else 0
-                
-                f.write(f"{driver:<15} {float(pub_rate):<15.0f} {float(con_rate):<15.0f} "
-                       f"{float(p50_lat):<15.2f} {float(p99_lat):<15.2f} {float(e2e_avg):<15.2f}\n")
-            
-            f.write("\n")
-    
-    print(f"Created: {output_dir}/summary.txt")
-
-def create_comparison_report(grouped_results: Dict[str, List[Dict[str, Any]]], output_dir: str):
+        for result in results:
+            out.append(f"{result['driver']:<15} {result['publishRate']:<15.0f} {result['consumeRate']:<15.0f} "
+                      f"{result['publishLatency50pct']:<15.2f} {result['publishLatency99pct']:<15.2f} "
+                      f"{result['endToEndLatencyAvg']:<15.2f}\n")
+        
+        out.append("\n")
+    
+    summary_path = output_dir / 'summary.txt'
+    with open(summary_path, 'w', buffering=1 << 16) as f:
+        f.write(''.join(out))
+    
+    print(f"Created: {summary_path}")
+
+def create_comparison_report(grouped_results: Dict[str, List[Dict[str, Any]]],
+                             grouped_columns: Dict[str, Dict[str, np.ndarray]], output_dir: Path):
     """Create detailed comparison report"""
-    with open(f"{output_dir}/comparison_report.md", 'w') as f:
-        f.write("# Vehicle IoT Streaming Benchmark Results\n\n")
-        f.write("## Overview\n\n")
-        f.write("This report compares **NATS**, **Apache Pulsar**, and **Pravega** for a vehicle IoT streaming use case with 100,000 vehicles.\n\n")
+    out = []
+    out.append("# Vehicle IoT Streaming Benchmark Results\n\n")
+    out.append("## Overview\n\n")
+    out.append("This report compares **NATS**, **Apache Pulsar**, and **Pravega** for a vehicle IoT streaming use case with 100,000 vehicles.\n\n")
+    
+    for workload, results in grouped_results.items():
+        columns = grouped_columns[workload]
+        out.append(f"## {workload}\n\n")
+        
+        # Create table
+        out.append("| Metric | " + " | ".join([r.get('driver', 'unknown') for r in results]) + " |\n")
+        out.append("|--------|" + "|".join(["--------"] * len(results)) + "|\n")
+        
+        # Throughput
+        out.append("| **Publish Rate (msg/s)** | ")
+        out.append(" | ".join([f"{val:,.0f}" for val in columns['publishRate']]) + " |\n")
+        
+        out.append("| **Consume Rate (msg/s)** | ")
+        out.append(" | ".join([f"{val:,.0f}" for val in columns['consumeRate']]) + " |\n")
+        
+        # Latency
+        out.append("| **Publish P50 Latency (ms)** | ")
+        out.append(" | ".join([f"{val:.2f}" for val in columns['publishLatency50pct']]) + " |\n")
+        
+        out.append("| **Publish P99 Latency (ms)** | ")
+        out.append(" | ".join([f"{val:.2f}" for val in columns['publishLatency99pct']]) + " |\n")
         
-        for workload, results in grouped_results.items():
-            f.write(f"## {workload}\n\n")
-            
-            # Create table
-            f.write("| Metric | " + " | ".join([r.get('driver', 'unknown') for r in results]) + " |\n")
-            f.write("|--------|" + "|".join(["--------"] * len(results)) + "|\n")
-            
-            # Helper function to extract and aggregate
-            def get_mean(val):
-                if isinstance(val, (list, np.ndarray)):
-                    return float(np.mean(val)) if len(val) > 0 else 0.0
-                return float(val) if val else 0.0
-            
-            # Throughput
-            f.write("| **Publish Rate (msg/s)** | ")
-            f.write(" | ".join([f"{get_mean(r.get('publishRate', 0)):,.0f}" for r in results]) + " |\n")
-            
-            f.write("| **Consume Rate (msg/s)** | ")
-            f.write(" | ".join([f"{get_mean(r.get('consumeRate', 0)):,.0f}" for r in results]) + " |\n")
-            
-            # Latency
-            f.write("| **Publish P50 Latency (ms)** | ")
-            f.write(" | ".join([f"{get_mean(r.get('publishLatency50pct', 0)):.2f}" for r in results]) + " |\n")
-            
-            f.write("| **Publish P99 Latency (ms)** | ")
-            f.write(" | ".join([f"{get_mean(r.get('publishLatency99pct', 0)):.2f}" for r in results]) + " |\n")
-            
-            f.write("| **End-to-End Avg Latency (ms)** | ")
-            f.write(" | ".join([f"{get_mean(r.get('endToEndLatencyAvg', 0)):.2f}" for r in results]) + " |\n")
-            
-            f.write("| **End-to-End P99 Latency (ms)** | ")
-            f.write(" | ".join([f"{get_mean(r.get('endToEndLatency99pct', 0)):.2f}" for r in results]) + " |\n")
-            
-            f.write("\n")
-            
-            # Winner analysis
-            f.write("### Analysis\n\n")
-            
-            # Find best throughput (extract means first)
-            throughputs = [get_mean(r.get('publishRate', 0)) for r in results]
-            best_throughput_idx = max(range(len(results)), key=lambda i: throughputs[i])
-            f.write(f"- **Best Throughput**: {results[best_throughput_idx].get('driver', 'unknown')} ")
-            f.write(f"({throughputs[best_throughput_idx]:,.0f} msg/s)\n")
-            
-            # Find best latency (extract means first)
-            latencies = [get_mean(r.get('publishLatency99pct', float('inf'))) for r in results]
-            best_latency_idx = min(range(len(results)), key=lambda i: latencies[i] if latencies[i] > 0 else float('inf'))
-            f.write(f"- **Lowest P99 Latency**: {results[best_latency_idx].get('driver', 'unknown')} ")
-            f.write(f"({latencies[best_latency_idx]:.2f} ms)\n")
-            
-            f.write("\n")
-    
-    print(f"Created: {output_dir}/comparison_report.md")
+        out.append("| **End-to-End Avg Latency (ms)** | ")
+        out.append(" | ".join([f"{val:.2f}" for val in columns['endToEndLatencyAvg']]) + " |\n")
+        
+        out.append("| **End-to-End P99 Latency (ms)** | ")
+        out.append(" | ".join([f"{val:.2f}" for val in columns['endToEndLatency99pct']]) + " |\n")
+        
+        out.append("\n")
+        
+        # Winner analysis
+        out.append("### Analysis\n\n")
+        
+        # Find best throughput
+        throughputs = columns['publishRate']
+        best_throughput_idx = int(np.argmax(throughputs))
+        out.append(f"- **Best Throughput**: {results[best_throughput_idx].get('driver', 'unknown')} ")
+        out.append(f"({throughputs[best_throughput_idx]:,.0f} msg/s)\n")
+        
+        # Find best latency, ignoring missing (zero) values
+        latencies = columns['publishLatency99pct']
+        best_latency_idx = int(np.argmin(np.where(latencies > 0, latencies, np.inf)))
+        out.append(f"- **Lowest P99 Latency**: {results[best_latency_idx].get('driver', 'unknown')} ")
+        out.append(f"({latencies[best_latency_idx]:.2f} ms)\n")
+        
+        out.append("\n")
+    
+    report_path = output_dir / 'comparison_report.md'
+    with open(report_path, 'w', buffering=1 << 16) as f:
+        f.write(''.join(out))
+    
+    print(f"Created: {report_path}")
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: python3 generate-charts.py <results_directory>")
+# Bump whenever chart rendering changes, so cached PNGs are redrawn
+CHART_VERSION = 1
+
+# Per-workload charts, by output file name
+CHARTS = (
+    ('throughput_comparison.png', create_throughput_chart),
+    ('latency_comparison.png', create_latency_chart),
+    ('end_to_end_latency_comparison.png', create_end_to_end_latency_chart),
+)
+
+def _import_pyplot():
+    """Import pyplot on the off-screen Agg backend, so no GUI backend is probed"""
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("Error: matplotlib is required")
+        print("Install it with: pip3 install matplotlib")
         sys.exit(1)
+    plt.rcParams['interactive'] = False
+    return plt
+
+def _chart_key(drivers: List[str], columns: Dict[str, np.ndarray], dpi: int) -> str:
+    """Hash what a workload's charts depend on: drivers, metric columns, dpi and chart version"""
+    payload = _dumps({'version': CHART_VERSION, 'dpi': dpi, 'drivers': drivers, 'columns': columns})
+    return hashlib.blake2b(payload).hexdigest()
+
+def _cached(path: Path, key: str, render: Callable[[], None]):
+    """Call render unless path exists with a .hash sidecar matching key"""
+    hash_path = path.with_name(path.name + '.hash')
+    if path.exists() and hash_path.exists() and hash_path.read_text() == key:
+        print(f"Unchanged: {path}")
+        return
+    render()
+    hash_path.write_text(key)
+
+def _save_chart(fig, ax, create_chart: Callable, columns: Dict[str, np.ndarray],
+                x: np.ndarray, drivers: List[str], path: Path, dpi: int):
+    """Draw a chart on the shared axes and save the figure to path"""
+    ax.clear()
+    create_chart(columns, ax, x, drivers)
+    fig.tight_layout()
+    # Low zlib compression: larger PNGs, but much faster to encode
+    fig.savefig(path, dpi=dpi, pil_kwargs={'compress_level': 1})
+    print(f"Created: {path}")
+
+def _render_workload(job):
+    """Render all charts of one workload; job is (workload, results, columns, charts_dir, dpi)"""
+    workload, workload_results, columns, charts_dir, dpi = job
+    plt = _import_pyplot()
+    print(f"\nProcessing workload: {workload}")
+    
+    # Workload names come from result files; keep them inside charts_dir
+    workload_dir = charts_dir / workload.lstrip('/\\')
+    if charts_dir.resolve() not in workload_dir.resolve().parents:
+        print(f"Error: workload name {workload!r} points outside {charts_dir}, skipping")
+        return
+    workload_dir.mkdir(parents=True, exist_ok=True)
+    
+    # Bar positions and tick labels are shared by every chart of the workload
+    drivers = [r['driver'] for r in workload_results]
+    x = np.arange(len(drivers))
+    
+    # One figure is reused for every chart
+    fig, ax = plt.subplots(figsize=(12, 6))
+    
+    # Skip charts whose inputs are unchanged since the last run
+    key = _chart_key(drivers, columns, dpi)
+    for filename, create_chart in CHARTS:
+        path = workload_dir / filename
+        _cached(path, key, lambda: _save_chart(fig, ax, create_chart, columns, x, drivers, path, dpi))
+    
+    plt.close(fig)
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate comparison charts from benchmark results")
+    parser.add_argument('results_dir', metavar='results_directory',
+                        help="directory containing the benchmark result JSON files")
+    parser.add_argument('--dpi', type=int, default=150,
+                        help="resolution of the rendered PNG charts (default: 150)")
+    args = parser.parse_args()
+    
+    if args.dpi <= 0:
+        parser.error(f"--dpi must be a positive integer, got {args.dpi}")
     
-    results_dir = sys.argv[1]
+    results_dir = Path(args.results_dir)
     
-    if not os.path.exists(results_dir):
+    if not results_dir.exists():
         print(f"Error: Directory {results_dir} does not exist")
         sys.exit(1)
     
+    # Fail fast if matplotlib is missing
+    _import_pyplot()
+    
     # Create charts directory
-    charts_dir = f"{results_dir}/charts"
-    os.makedirs(charts_dir, exist_ok=True)
+    charts_dir = results_dir / 'charts'
+    charts_dir.mkdir(parents=True, exist_ok=True)
     
     print(f"\nLoading results from: {results_dir}")
     results = load_results(results_dir)
@@ -328,38 +491,32 @@ def main():
     
     print(f"\nGenerating charts in: {charts_dir}")
     
-    # Generate charts for each workload
-    for workload, workload_results in grouped_results.items():
-        print(f"\nProcessing workload: {workload}")
-        
-        workload_dir = f"{charts_dir}/{workload}"
-        os.makedirs(workload_dir, exist_ok=True)
-        
-        create_throughput_chart(workload_results, workload_dir)
-        create_latency_chart(workload_results, workload_dir)
-        create_end_to_end_latency_chart(workload_results, workload_dir)
+    # Metric columns are built once per workload and shared by charts and report
+    grouped_columns = {workload: build_columns(workload_results)
+                       for workload, workload_results in grouped_results.items()}
+    
+    # Workloads render independently, so spread them across processes
+    jobs = [(workload, workload_results, grouped_columns[workload], charts_dir, args.dpi)
+            for workload, workload_results in grouped_results.items()]
+    if len(jobs) >= PARALLEL_RENDER_MIN_WORKLOADS:
+        with ProcessPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as executor:
+            list(executor.map(_render_workload, jobs))
+    else:
+        for job in jobs:
+            _render_workload(job)
     
     # Generate summary
     print("\nGenerating summary...")
     create_summary_table(grouped_results, charts_dir)
-    create_comparison_report(grouped_results, charts_dir)
+    create_comparison_report(grouped_results, grouped_columns, charts_dir)
     
     print("\n" + "=" * 60)
     print("Charts generation complete!")
     print("=" * 60)
     print(f"\nCharts saved to: {charts_dir}/")
-    print(f"Summary: {charts_dir}/summary.txt")
-    print(f"Detailed report: {charts_dir}/comparison_report.md")
+    print(f"Summary: {charts_dir / 'summary.txt'}")
+    print(f"Detailed report: {charts_dir / 'comparison_report.md'}")
     print()
 
 if __name__ == "__main__":
-    # Check for matplotlib
-    try:
-        import matplotlib.pyplot as plt
-        import matplotlib.patches as mpatches
-    except ImportError:
-        print("Error: matplotlib is required")
-        print("Install it with: pip3 install matplotlib")
-        sys.exit(1)
-    
     main()